@@ -1,5 +1,4 @@
 import json
-import os
 from core.midi_data_model import MidiDocument
 from config import AppSettings
 
@@ -12,22 +11,7 @@ class MidiApplication:
         
     def _load_settings(self, config_path: str = "config.json") -> AppSettings:
         """Load settings from file or return defaults"""
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r') as f:
-                    data = json.load(f)
-                
-                # Create settings with loaded data
-                settings = AppSettings()
-                for key, value in data.items():
-                    if hasattr(settings, key):
-                        setattr(settings, key, value)
-                return settings
-                
-            except Exception as e:
-                print(f"Error loading settings: {e}")
-        
-        return AppSettings()
+        return AppSettings.load(config_path)
     
     def save_settings(self, config_path: str = "config.json"):
         """Save current settings to file"""
@@ -1,3 +1,5 @@
+import json
+import os
 from dataclasses import dataclass, field
 from typing import Dict, Any, List, Tuple
 
@@ -33,6 +35,7 @@ class UIConstants:
     grid_subdivision_color: Tuple[int, int, int] = (230, 230, 230)
     grid_octave_color: Tuple[int, int, int] = (180, 180, 180)
     grid_note_color: Tuple[int, int, int] = (240, 240, 240)
+    grid_min_subdivision_spacing: float = 8.0  # Pixels; closer 1/16 lines are not drawn
     
     # Piano Key Colors
     white_key_color: Tuple[int, int, int] = (255, 255, 255)
@@ -121,4 +124,24 @@ class AppSettings:
     
     # UI Configuration
     ui_constants: UIConstants = field(default_factory=UIConstants)
-    piano_roll_config: PianoRollConfig = field(default_factory=PianoRollConfig)
\ No newline at end of file
+    piano_roll_config: PianoRollConfig = field(default_factory=PianoRollConfig)
+    
+    @classmethod
+    def load(cls, config_path: str = "config.json") -> 'AppSettings':
+        """Load settings from file or return defaults"""
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r') as f:
+                    data = json.load(f)
+                
+                # Create settings with loaded data
+                settings = cls()
+                for key, value in data.items():
+                    if hasattr(settings, key):
+                        setattr(settings, key, value)
+                return settings
+                
+            except Exception as e:
+                print(f"Error loading settings: {e}")
+        
+        return cls()
\ No newline at end of file
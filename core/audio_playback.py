@@ -1,7 +1,6 @@
 import pretty_midi
 import mido
 import time
-import simpleaudio as sa
 
 class MidiPlayback:
     def __init__(self, document_path: str):
@@ -54,7 +53,8 @@ class MidiPlayback:
                     )
                     self.outport.send(msg_off)
         elif self.midi_data is not None:
-            # Play the synthesized audio
+            # Play the synthesized audio; simpleaudio is only needed for this fallback
+            import simpleaudio as sa
             play_obj = sa.play_buffer(self.midi_data.astype('int16'), 1, 2, 44100)
             play_obj.wait_done()
             self.is_playing = False
@@ -7,6 +7,19 @@ from enum import Enum
 import copy
 import bisect
 
+from config import KEY_NAMES, MAJOR_KEY_PROFILE, MINOR_KEY_PROFILE
+
+# Krumhansl-Schmuckler profiles rotated to all 24 keys: rows 0-11 are major roots,
+# rows 12-23 minor roots. Rows are mean-centred and unit length, so a dot product
+# with a centred histogram ranks keys exactly as the Pearson correlation does.
+_KEY_TEMPLATES = np.stack([
+    np.roll(profile, root)
+    for profile in (MAJOR_KEY_PROFILE, MINOR_KEY_PROFILE)
+    for root in range(12)
+]).astype(np.float32)
+_KEY_TEMPLATES -= _KEY_TEMPLATES.mean(axis=1, keepdims=True)
+_KEY_TEMPLATES /= np.linalg.norm(_KEY_TEMPLATES, axis=1, keepdims=True)
+
 class EventType(Enum):
     """MIDI event types for internal representation"""
     CONTROL_CHANGE = "control_change"
@@ -14,7 +27,7 @@ class EventType(Enum):
     PITCH_BEND = "pitch_bend"
     AFTERTOUCH = "aftertouch"
 
-@dataclass
+@dataclass(slots=True)
 class MidiNote:
     """
     Enhanced MIDI note class that wraps pretty_midi.Note
@@ -109,7 +122,7 @@ class MidiNote:
             selected=False  # Don't copy selection state
         )
 
-@dataclass
+@dataclass(slots=True)
 class MidiEvent:
     """Represents non-note MIDI events (control changes, etc.)"""
     time: float                     # Time in seconds
@@ -134,6 +147,11 @@ class MidiTrack:
     Maintains existing API while leveraging pretty_midi features
     """
     
+    __slots__ = (
+        'name', 'program', 'is_drum', '_pm_instrument', '_notes', 'events',
+        'muted', 'solo', 'volume', 'pan', 'visible', 'color', 'channel', '_version'
+    )
+    
     def __init__(self, name: str = "Untitled Track", program: int = 0, is_drum: bool = False):
         self.name = name
         self.program = program
@@ -162,6 +180,9 @@ class MidiTrack:
         
         # Channel is derived from program for compatibility
         self.channel = program % 16
+        
+        # Bumped whenever the pretty_midi notes change, so documents can cache derived values
+        self._version = 0
     
     @property
     def notes(self) -> List[MidiNote]:
@@ -173,17 +194,49 @@ class MidiTrack:
         self._notes.append(note)
         # Sync with pretty_midi instrument
         self._pm_instrument.notes.append(note.to_pretty_midi_note())
+        self._version += 1
     
     def remove_note(self, note: MidiNote) -> bool:
-        """Remove a note from the track. Returns True if found and removed."""
-        try:
-            index = self._notes.index(note)
-            del self._notes[index]
+        """Remove a note from the track. Returns True if found and removed.
+        
+        Notes are matched by identity, like remove_notes, so an equal-valued copy is left alone.
+        """
+        index = next((i for i, existing in enumerate(self._notes) if existing is note), None)
+        if index is None:
+            return False
+        del self._notes[index]
+        if len(self._pm_instrument.notes) == len(self._notes) + 1:
             # Also remove from pretty_midi instrument
             del self._pm_instrument.notes[index]
-            return True
-        except (ValueError, IndexError):
-            return False
+            self._version += 1
+        else:
+            # Tracks loaded from a file start with an empty instrument
+            self._sync_with_pretty_midi()
+        return True
+    
+    def remove_notes(self, notes: List[MidiNote]) -> int:
+        """Remove several notes in a single pass. Returns the number of notes removed."""
+        to_remove = {id(note) for note in notes}
+        if len(self._pm_instrument.notes) != len(self._notes):
+            # Lists are out of step (tracks loaded from a file start with an empty instrument)
+            kept = [note for note in self._notes if id(note) not in to_remove]
+            removed = len(self._notes) - len(kept)
+            if removed:
+                self._notes[:] = kept
+                self._sync_with_pretty_midi()
+            return removed
+        
+        # Filter both lists together, relying on the same index pairing as remove_note
+        kept_pairs = [
+            (note, pm_note) for note, pm_note in zip(self._notes, self._pm_instrument.notes)
+            if id(note) not in to_remove
+        ]
+        removed = len(self._notes) - len(kept_pairs)
+        if removed:
+            self._notes[:] = [note for note, _ in kept_pairs]
+            self._pm_instrument.notes[:] = [pm_note for _, pm_note in kept_pairs]
+            self._version += 1
+        return removed
     
     def add_event(self, event: MidiEvent):
         """Add an event to the track"""
@@ -255,19 +308,26 @@ class MidiTrack:
         if not self._notes and not self.events:
             return (0.0, 0.0)
         
-        min_time = float('inf')
-        max_time = 0.0
-        
-        for note in self._notes:
-            min_time = min(min_time, note.start)
-            max_time = max(max_time, note.end)
-        
-        for event in self.events:
-            min_time = min(min_time, event.time)
-            max_time = max(max_time, event.time)
+        # Builtin min/max over generators keep the comparisons in C
+        min_time = min(
+            min((note.start for note in self._notes), default=float('inf')),
+            min((event.time for event in self.events), default=float('inf'))
+        )
+        max_time = max(
+            max((note.end for note in self._notes), default=0.0),
+            max((event.time for event in self.events), default=0.0)
+        )
         
         return (min_time if min_time != float('inf') else 0.0, max_time)
     
+    def get_note_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Get (starts, ends, pitches, velocities) as parallel arrays for vectorized analysis"""
+        data = np.array(
+            [(note.start, note.end, note.pitch, note.velocity) for note in self._notes],
+            dtype=np.float64
+        ).reshape(-1, 4)
+        return data[:, 0], data[:, 1], data[:, 2].astype(np.int16), data[:, 3].astype(np.int16)
+    
     def get_pitch_classes_at_time(self, time: float) -> Set[int]:
         """Get all pitch classes playing at specified time"""
         notes_at_time = self.get_notes_at_time(time)
@@ -284,6 +344,7 @@ class MidiTrack:
         self._pm_instrument.notes.clear()
         for note in self._notes:
             self._pm_instrument.notes.append(note.to_pretty_midi_note())
+        self._version += 1
     
     def copy(self) -> 'MidiTrack':
         """Create a deep copy of this track"""
@@ -332,10 +393,20 @@ class MidiDocument:
         
         # Default tempo (will be overridden if tempo can be estimated)
         self._default_tempo = 120.0
+        
+        # (track versions, tempo) from the last estimate; estimate_tempo is expensive
+        self._tempo_cache: Optional[Tuple[Tuple[int, ...], float]] = None
     
     @property
     def tempo_bpm(self) -> float:
-        """Get current tempo in BPM with robust error handling"""
+        """Get current tempo in BPM, re-estimated only when notes have changed"""
+        cache_key = tuple(track._version for track in self.tracks)
+        if self._tempo_cache is None or self._tempo_cache[0] != cache_key:
+            self._tempo_cache = (cache_key, self._estimate_tempo())
+        return self._tempo_cache[1]
+    
+    def _estimate_tempo(self) -> float:
+        """Estimate tempo with pretty_midi, falling back to the default tempo"""
         try:
             # Only try to estimate if we have instruments with enough notes
             if self._pm.instruments:
@@ -354,6 +425,7 @@ class MidiDocument:
     def tempo_bpm(self, value: float):
         """Set the default tempo"""
         self._default_tempo = max(20.0, min(300.0, value))  # Reasonable tempo range
+        self._tempo_cache = None
     
     @property
     def time_signature(self) -> Tuple[int, int]:
@@ -391,6 +463,7 @@ class MidiDocument:
         
         self.tracks.append(track)
         self._pm.instruments.append(track._pm_instrument)
+        self._tempo_cache = None
         self.modified = True
         return track
     
@@ -399,6 +472,7 @@ class MidiDocument:
         if 0 <= track_index < len(self.tracks):
             del self.tracks[track_index]
             del self._pm.instruments[track_index]
+            self._tempo_cache = None
             
             # Update selected tracks
             self.selected_tracks.discard(track_index)
@@ -524,20 +598,26 @@ class MidiDocument:
     
     # Advanced analysis methods using pretty_midi
     def estimate_key(self) -> Tuple[str, str]:
-        """Estimate the key using pretty_midi's built-in analysis with error handling"""
-        if not self._pm.instruments:
+        """Estimate the key with Krumhansl-Schmuckler correlation against all 24 key profiles"""
+        if not self.tracks:
             return ("C", "major")
         
         try:
-            # Get key estimate from pretty_midi
-            key_number = self._pm.estimate_key()
+            note_arrays = [track.get_note_arrays() for track in self.tracks if not track.is_drum]
+            if not note_arrays:
+                return ("C", "major")
+            starts, ends, pitches, _ = (np.concatenate(column) for column in zip(*note_arrays))
+            
+            # Duration-weighted pitch-class histogram
+            durations = np.maximum(ends - starts, 0.0)
+            histogram = np.bincount(pitches % 12, weights=durations, minlength=12).astype(np.float32)
+            if np.count_nonzero(histogram) < 3:
+                # Fewer than three pitch classes cannot distinguish a key
+                return ("C", "major")
             
-            # Convert to readable format
-            key_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-            if key_number < 12:
-                return (key_names[key_number], "major")
-            else:
-                return (key_names[key_number - 12], "minor")
+            scores = _KEY_TEMPLATES @ (histogram - histogram.mean())
+            key_index = int(np.argmax(scores))
+            return (KEY_NAMES[key_index % 12], "major" if key_index < 12 else "minor")
                 
         except (ValueError, Exception):
             return ("C", "major")
@@ -12,12 +12,6 @@ import os
 import logging
 from pathlib import Path
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
 logger = logging.getLogger(__name__)
 
 # Project root for resource paths
@@ -26,22 +20,20 @@ PROJECT_ROOT = Path(__file__).parent
 def create_application():
     """Create and configure the Qt application"""
     from PyQt6.QtWidgets import QApplication
-    from PyQt6.QtCore import Qt
-    from PyQt6.QtGui import QIcon
-    
-    # Enable high DPI support
-    QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
-    QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
+    from PyQt6.QtCore import QTimer
     
+    # High DPI scaling is always enabled in Qt6, so no application attributes are needed
     app = QApplication(sys.argv)
     app.setApplicationName("mico")
     app.setApplicationVersion("1.0.0")
     app.setOrganizationName("MIDI_COMPOSE")
     
-    # Set application icon if available
+    # Set application icon if available, decoding it once the event loop is running
+    # so it does not delay the first paint; headless platforms never show it
     icon_path = PROJECT_ROOT / "resources" / "icon.png"
-    if icon_path.exists():
-        app.setWindowIcon(QIcon(str(icon_path)))
+    if icon_path.exists() and app.platformName() not in ("offscreen", "minimal"):
+        from PyQt6.QtGui import QIcon
+        QTimer.singleShot(0, lambda: app.setWindowIcon(QIcon(str(icon_path))))
     
     return app
 
@@ -79,6 +71,18 @@ def create_main_window():
         
         return FallbackWindow()
 
+def preload_core_modules():
+    """Import the pretty_midi-backed core on a background thread while Qt starts up"""
+    import threading
+    
+    def import_core():
+        try:
+            import core.midi_data_model
+        except Exception:
+            pass  # create_main_window imports it again and reports the failure
+    
+    threading.Thread(target=import_core, name="core-preload", daemon=True).start()
+
 def setup_exception_handling():
     """Setup global exception handling"""
     def handle_exception(exc_type, exc_value, exc_traceback):
@@ -106,19 +110,27 @@ def setup_exception_handling():
 
 def main():
     """Main application entry point"""
-    print("mico is starting up...")
-    print("=" * 40)
+    # Configure logging here rather than at import so importing main stays side-effect free
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    print("mico is starting up...\n" + "=" * 40)
     
     # Setup exception handling
     setup_exception_handling()
     
+    # Overlap the pretty_midi/numpy import with QApplication construction
+    preload_core_modules()
+    
     try:
         # Create Qt application
-        logger.info("Creating Qt application...")
+        logger.debug("Creating Qt application...")
         app = create_application()
         
         # Create main window
-        logger.info("Creating main window...")
+        logger.debug("Creating main window...")
         main_window = create_main_window()
         
         # Show main window
@@ -131,7 +143,7 @@ def main():
         y = (screen.height() - window_geometry.height()) // 2
         main_window.move(x, y)
         
-        logger.info("✅ Application started successfully")
+        logger.debug("✅ Application started successfully")
         print("🚀 mico is ready!")
         
         # Start the event loop
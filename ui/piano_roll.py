@@ -1,5 +1,6 @@
 import sys
 import os
+import logging
 from typing import Optional, Tuple, Dict, Any
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGraphicsView, QGraphicsScene, 
@@ -8,10 +9,18 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QBrush, QPen, QColor, QFont, QPainter
 from PyQt6.QtCore import Qt, QRectF, QPointF, pyqtSignal
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Only needed when this file is run directly; as part of the ui package the project root is already importable
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.midi_data_model import MidiDocument, MidiNote
 from config import AppSettings, KEY_NAMES, UIConstants, PianoRollConfig
 
+logger = logging.getLogger(__name__)
+
+# Pitch classes of the white and black piano keys
+WHITE_KEY_CLASSES = frozenset({0, 2, 4, 5, 7, 9, 11})
+BLACK_KEY_CLASSES = frozenset({1, 3, 6, 8, 10})
+
 class NoteItem(QGraphicsRectItem):
     """Graphics item for MIDI notes."""
     def __init__(self, midi_note: MidiNote, note_height: float, seconds_per_pixel: float, settings: AppSettings, parent=None):
@@ -70,40 +79,38 @@ class PianoKeyboard(QWidget):
         self.visible_range = self.settings.piano_roll_config.keyboard_visible_range
         self.setFixedWidth(self.settings.ui_constants.piano_keyboard_width)
         self.setMinimumHeight(int((self.visible_range[1] - self.visible_range[0] + 1) * self.note_height))
+        
+        # Key brushes, pens and the octave label font are static, so build them once rather than per paint
+        ui = self.settings.ui_constants
+        self._white_key_brush = QBrush(QColor.fromRgb(*ui.white_key_color))
+        self._white_key_alt_brush = QBrush(QColor.fromRgb(*ui.white_key_alt_color))
+        self._white_key_pen = QPen(QColor.fromRgb(*ui.white_key_border_color))
+        self._black_key_brush = QBrush(QColor.fromRgb(*ui.black_key_color))
+        self._black_key_pen = QPen(QColor.fromRgb(*ui.black_key_border_color))
+        self._label_font = QFont("Arial", 8)
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        ui = self.settings.ui_constants
-        colors = {
-            "white_key": ui.white_key_color,
-            "white_key_alt": ui.white_key_alt_color,
-            "white_key_border": ui.white_key_border_color,
-            "black_key": ui.black_key_color,
-            "black_key_border": ui.black_key_border_color
-        }
+        painter.setFont(self._label_font)
 
         white_key_width, black_key_width = self.width(), int(self.width() * 0.6)
-        white_key_notes, black_key_notes = {0, 2, 4, 5, 7, 9, 11}, {1, 3, 6, 8, 10}
         low_pitch, high_pitch = self.visible_range
         
         for pitch in range(low_pitch, high_pitch + 1):
             y = (high_pitch - pitch) * self.note_height
             note_class = pitch % 12
-            if note_class in white_key_notes:
-                brush_color = colors['white_key'] if pitch % 12 == 0 else colors['white_key_alt']
-                painter.fillRect(0, int(y), white_key_width, int(self.note_height), QBrush(QColor.fromRgb(*brush_color)))
-                painter.setPen(QPen(QColor.fromRgb(*colors['white_key_border'])))
+            if note_class in WHITE_KEY_CLASSES:
+                brush = self._white_key_brush if pitch % 12 == 0 else self._white_key_alt_brush
+                painter.fillRect(0, int(y), white_key_width, int(self.note_height), brush)
+                painter.setPen(self._white_key_pen)
                 painter.drawRect(0, int(y), white_key_width - 1, int(self.note_height) - 1)
                 if pitch % 12 == 0:
                     painter.setPen(Qt.GlobalColor.black)
-                    painter.setFont(QFont("Arial", 8))
                     painter.drawText(5, int(y + self.note_height - 5), f"C{pitch // 12 - 1}")
-            elif note_class in black_key_notes:
-                brush_color = colors['black_key']
-                painter.fillRect(0, int(y), black_key_width, int(self.note_height), QBrush(QColor.fromRgb(*brush_color)))
-                painter.setPen(QPen(QColor.fromRgb(*colors['black_key_border'])))
+            elif note_class in BLACK_KEY_CLASSES:
+                painter.fillRect(0, int(y), black_key_width, int(self.note_height), self._black_key_brush)
+                painter.setPen(self._black_key_pen)
                 painter.drawRect(0, int(y), black_key_width - 1, int(self.note_height) - 1)
 
 class PianoRollWidget(QGraphicsView):
@@ -148,19 +155,20 @@ class PianoRollWidget(QGraphicsView):
             "note": (ui.grid_note_color, 1)
         }
         
-        # Vertical lines (time grid)
-        tempo_bpm = self.document.tempo_bpm
-        seconds_per_beat = 60.0 / tempo_bpm
-        seconds_per_measure = seconds_per_beat * self.document.time_signature[0]
+        # Vertical lines (time grid): step straight through the 1/16 grid instead of testing every pixel
+        seconds_per_subdivision = 60.0 / self.document.tempo_bpm / 4
+        subdivisions_per_measure = 4 * self.document.time_signature[0]
+        grid_width = int(scene_rect.width())
+        time_pens = {kind: QPen(QColor.fromRgb(*pen_configs[kind][0]), pen_configs[kind][1]) for kind in ("measure", "beat", "subdivision")}
+        
+        # Skip 1/16 lines when zoomed out far enough that they would only fill the background
+        step = 1 if seconds_per_subdivision / self.seconds_per_pixel >= ui.grid_min_subdivision_spacing else 4
         
-        for x in range(int(scene_rect.width())):
-            time_seconds = x * self.seconds_per_pixel
-            pen = None
-            if abs(time_seconds % seconds_per_measure) < 1e-6: pen = QPen(QColor.fromRgb(*pen_configs["measure"][0]), pen_configs["measure"][1])
-            elif abs(time_seconds % seconds_per_beat) < 1e-6: pen = QPen(QColor.fromRgb(*pen_configs["beat"][0]), pen_configs["beat"][1])
-            elif abs(time_seconds % (seconds_per_beat / 4)) < 1e-6: pen = QPen(QColor.fromRgb(*pen_configs["subdivision"][0]), pen_configs["subdivision"][1])
-            
-            if pen: self.scene.addLine(x, 0, x, scene_rect.height(), pen).setZValue(-2)
+        for index in range(0, int(grid_width * self.seconds_per_pixel / seconds_per_subdivision) + 1, step):
+            x = index * seconds_per_subdivision / self.seconds_per_pixel
+            if x >= grid_width: break
+            kind = "measure" if index % subdivisions_per_measure == 0 else "beat" if index % 4 == 0 else "subdivision"
+            self.scene.addLine(x, 0, x, scene_rect.height(), time_pens[kind]).setZValue(-2)
 
         # Horizontal lines (pitch grid)
         for pitch in range(self.lowest_pitch, self.highest_pitch + 1):
@@ -226,9 +234,7 @@ class PianoRollWidget(QGraphicsView):
     def delete_selected_notes(self):
         track = self.get_current_track()
         if not track: return
-        notes_to_delete = [note for note in track.notes if note.selected]
-        for note in notes_to_delete: track.remove_note(note)
-        if notes_to_delete: self.refresh_notes(); self.document.modified = True; self.selection_changed.emit()
+        if track.remove_notes(track.get_selected_notes()): self.refresh_notes(); self.document.modified = True; self.selection_changed.emit()
 
     def select_all_notes(self):
         for item in self.note_items.values(): item.setSelected(True)
@@ -287,22 +293,13 @@ class PianoRollPanel(QWidget):
         bottom_row = QHBoxLayout()
         bottom_row.addWidget(QLabel(self.settings.ui_constants.control_labels["tool"]))
         
-        tool_configs = self._get_tool_button_configs()
-        self.pencil_btn = QPushButton(tool_configs["pencil"]["text"])
-        self.pencil_btn.setCheckable(True)
-        self.pencil_btn.setChecked(True)
-        self.pencil_btn.setToolTip(tool_configs["pencil"]["tooltip"])
-        bottom_row.addWidget(self.pencil_btn)
-        
-        self.select_btn = QPushButton(tool_configs["select"]["text"])
-        self.select_btn.setCheckable(True)
-        self.select_btn.setToolTip(tool_configs["select"]["tooltip"])
-        bottom_row.addWidget(self.select_btn)
-        
-        self.erase_btn = QPushButton(tool_configs["erase"]["text"])
-        self.erase_btn.setCheckable(True)
-        self.erase_btn.setToolTip(tool_configs["erase"]["tooltip"])
-        bottom_row.addWidget(self.erase_btn)
+        self.tool_buttons: Dict[str, QPushButton] = {}
+        default_tool = self.settings.piano_roll_config.default_tool
+        for tool_name, config in self._get_tool_button_configs().items():
+            btn = QPushButton(config["text"], checkable=True, checked=tool_name == default_tool, toolTip=config["tooltip"])
+            bottom_row.addWidget(btn)
+            self.tool_buttons[tool_name] = btn
+        self.pencil_btn, self.select_btn, self.erase_btn = (self.tool_buttons[name] for name in ("pencil", "select", "erase"))
         
         bottom_row.addWidget(QFrame(frameShape=QFrame.Shape.VLine))
         bottom_row.addWidget(QLabel(self.settings.ui_constants.control_labels["quantize"]))
@@ -350,9 +347,8 @@ class PianoRollPanel(QWidget):
     
     def connect_signals(self):
         self.track_combo.currentIndexChanged.connect(self.on_track_changed)
-        self.pencil_btn.clicked.connect(lambda: self._set_tool("pencil"))
-        self.select_btn.clicked.connect(lambda: self._set_tool("select"))
-        self.erase_btn.clicked.connect(lambda: self._set_tool("erase"))
+        for tool_name, btn in self.tool_buttons.items():
+            btn.clicked.connect(lambda _, t=tool_name: self._set_tool(t))
         self.velocity_slider.valueChanged.connect(self.on_velocity_changed)
         self.piano_roll.note_added.connect(self.on_note_added)
         self.piano_roll.note_removed.connect(self.on_note_removed)
@@ -376,16 +372,19 @@ class PianoRollPanel(QWidget):
     
     def _set_tool(self, tool_name: str):
         self.piano_roll.current_tool = tool_name
-        self.pencil_btn.setChecked(tool_name == "pencil")
-        self.select_btn.setChecked(tool_name == "select")
-        self.erase_btn.setChecked(tool_name == "erase")
+        for name, btn in self.tool_buttons.items():
+            btn.setChecked(name == tool_name)
     
     def on_note_added(self, note: MidiNote):
-        print(f"Note added: {KEY_NAMES[note.pitch % 12]}{note.pitch // 12 - 1} at {note.start:.2f}s, vel: {note.velocity}")
+        logger.debug("Note added: %s%d at %.2fs, vel: %d", KEY_NAMES[note.pitch % 12], note.pitch // 12 - 1, note.start, note.velocity)
     
     def on_note_removed(self, note: MidiNote):
-        print(f"Note removed: {KEY_NAMES[note.pitch % 12]}{note.pitch // 12 - 1}")
+        logger.debug("Note removed: %s%d", KEY_NAMES[note.pitch % 12], note.pitch // 12 - 1)
     
     def on_selection_changed(self):
-        selected_count = len(self.piano_roll.get_current_track().get_selected_notes()) if self.piano_roll.get_current_track() else 0
-        print(f"Selection changed: {selected_count} notes selected")
\ No newline at end of file
+        # Counting the selection walks every note in the track, so only do it when it will be logged
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        track = self.piano_roll.get_current_track()
+        selected_count = len(track.get_selected_notes()) if track else 0
+        logger.debug("Selection changed: %d notes selected", selected_count)
\ No newline at end of file